@@ -2,17 +2,26 @@
 
 import json
 import os
-import re
+import string
 
 DEFAULT_CONFIG_PATH = "/etc/ha_lights.conf"
 MAX_LIGHTS = 16
 
+# Characters allowed either side of the single '.' in an entity_id.
+_EID_CHARS = frozenset(string.ascii_letters + string.digits + "_")
+
 _config_path: str = DEFAULT_CONFIG_PATH
 _current_config: dict | None = None
+_cache_key: tuple[int, int] | None = None  # (mtime_ns, size) of last parse
 
 
 def _validate_entity_id(eid: str) -> bool:
-    return bool(re.match(r"^[a-zA-Z0-9_]+\.[a-zA-Z0-9_]+$", eid))
+    # Structural check: "<domain>.<object_id>", both parts non-empty and
+    # limited to [A-Za-z0-9_]. Cheaper than a regex for something this simple.
+    domain, sep, object_id = eid.partition(".")
+    if not sep or not domain or not object_id:
+        return False
+    return _EID_CHARS.issuperset(domain) and _EID_CHARS.issuperset(object_id)
 
 
 def _validate_label(label: str) -> bool:
@@ -54,8 +63,9 @@ def save(path: str, cfg: dict) -> None:
 
 
 def set_path(path: str) -> None:
-    global _config_path
+    global _config_path, _cache_key
     _config_path = path
+    _cache_key = None
 
 
 def get_path() -> str:
@@ -63,9 +73,14 @@ def get_path() -> str:
 
 
 def reload() -> dict:
-    """Reload config from disk and return it."""
-    global _current_config
+    """Reload config from disk, skipping the parse if the file is unchanged."""
+    global _current_config, _cache_key
+    st = os.stat(_config_path)
+    key = (st.st_mtime_ns, st.st_size)
+    if key == _cache_key and _current_config is not None:
+        return _current_config
     _current_config = load(_config_path)
+    _cache_key = key
     return _current_config
 
 
@@ -1,12 +1,20 @@
 """Web configuration server using Flask in a background thread."""
 
+import gzip
+import hmac
 import logging
 import os
 import secrets
 import threading
 import time
 
-from flask import Flask, request, redirect, session, jsonify, render_template_string
+import jinja2
+from flask import Flask, Response, request, redirect, session, jsonify
+
+try:
+    from waitress import serve as _waitress_serve
+except ImportError:  # fall back to the threaded dev server
+    _waitress_serve = None
 
 import config
 import ha_client
@@ -19,6 +27,14 @@ _cfg: dict | None = None
 _reload_callback = None
 
 SESSION_TIMEOUT = 3600  # 1 hour
+SECRET_PATH = "/etc/ha_lights.secret"
+LOGIN_RETRY_DELAY = 1.0  # seconds a client must wait after a failed login
+
+# {remote_ip: timestamp of last failed login} — lets us return 429 instead of
+# sleeping in the handler, which would tie up a worker thread. Pruned of
+# expired entries once it grows past _FAILED_LOGINS_MAX.
+_failed_logins: dict[str, float] = {}
+_FAILED_LOGINS_MAX = 128
 
 # --------------------------------------------------------------------------
 #  HTML templates
@@ -149,14 +165,58 @@ fetch("/api/config").then(r=>r.json()).then(d=>{
 }).catch(()=>location.href="/");
 </script></body></html>"""
 
+# Compiled/encoded once at import — the login page has a single {% if %} and
+# the settings page has no variables at all, so there's no need to re-run the
+# Jinja pipeline per request.
+_LOGIN_TMPL = jinja2.Template(LOGIN_HTML, autoescape=True)
+_SETTINGS_BYTES = SETTINGS_HTML.encode()
+
 
 # --------------------------------------------------------------------------
 #  Flask app factory
 # --------------------------------------------------------------------------
 
+def _load_secret_key() -> str:
+    """Read the session secret, generating and persisting it on first run.
+
+    Persisting it means sessions survive a process restart instead of
+    forcing everyone back through /login.
+    """
+    try:
+        with open(SECRET_PATH, "r") as f:
+            secret = f.read().strip()
+        if secret:
+            return secret
+    except OSError:
+        pass
+
+    secret = secrets.token_hex(32)
+    try:
+        fd = os.open(SECRET_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(secret)
+    except OSError as e:
+        log.warning("Could not persist session secret to %s: %s", SECRET_PATH, e)
+    return secret
+
+
 def _create_app(cfg_ref: dict, reload_cb) -> Flask:
     app = Flask(__name__)
-    app.secret_key = secrets.token_hex(32)
+    app.secret_key = _load_secret_key()
+
+    @app.after_request
+    def compress_response(response):
+        """Gzip larger responses (the settings page compresses ~70%)."""
+        if (
+            "gzip" in request.headers.get("Accept-Encoding", "")
+            and response.content_length and response.content_length > 500
+            and "Content-Encoding" not in response.headers
+        ):
+            data = gzip.compress(response.get_data(), compresslevel=6)
+            response.set_data(data)
+            response.headers["Content-Encoding"] = "gzip"
+            response.headers["Content-Length"] = str(len(data))
+        return response
 
     @app.before_request
     def check_session():
@@ -172,17 +232,28 @@ def _create_app(cfg_ref: dict, reload_cb) -> Flask:
     def index():
         if session.get("logged_in"):
             return redirect("/settings")
-        return render_template_string(LOGIN_HTML, error=None)
+        return _LOGIN_TMPL.render(error=None)
 
     @app.route("/login", methods=["POST"])
     def login():
+        ip = request.remote_addr or ""
+        if time.time() - _failed_logins.get(ip, 0) < LOGIN_RETRY_DELAY:
+            return "Too many attempts, try again shortly.", 429
         password = request.form.get("password", "")
-        if password and password == cfg_ref.get("web_password", ""):
+        # Compare as bytes — compare_digest rejects non-ASCII str input
+        if password and hmac.compare_digest(
+                password.encode(), cfg_ref.get("web_password", "").encode()):
+            _failed_logins.pop(ip, None)
             session["logged_in"] = True
             session["last_active"] = time.time()
             return redirect("/settings")
-        time.sleep(1)  # brute-force delay
-        return render_template_string(LOGIN_HTML, error="Incorrect password.")
+        now = time.time()
+        if len(_failed_logins) >= _FAILED_LOGINS_MAX:
+            cutoff = now - LOGIN_RETRY_DELAY
+            for stale in [k for k, t in _failed_logins.items() if t < cutoff]:
+                del _failed_logins[stale]
+        _failed_logins[ip] = now  # brute-force delay without sleeping
+        return _LOGIN_TMPL.render(error="Incorrect password.")
 
     @app.route("/logout", methods=["POST"])
     def logout():
@@ -193,7 +264,7 @@ def _create_app(cfg_ref: dict, reload_cb) -> Flask:
     def settings():
         if not session.get("logged_in"):
             return redirect("/")
-        return render_template_string(SETTINGS_HTML)
+        return Response(_SETTINGS_BYTES, mimetype="text/html")
 
     @app.route("/api/config", methods=["GET"])
     def get_config():
@@ -242,9 +313,15 @@ def start(port: int, cfg: dict, reload_cb=None) -> None:
     _reload_callback = reload_cb
     _app = _create_app(cfg, reload_cb)
 
-    _thread = threading.Thread(
-        target=lambda: _app.run(host="0.0.0.0", port=port, use_reloader=False),
-        daemon=True,
-    )
+    # waitress gives a small thread pool so one slow handler (e.g. a
+    # connection test against an unreachable HA) doesn't stall every request.
+    if _waitress_serve:
+        target = lambda: _waitress_serve(_app, host="0.0.0.0", port=port,
+                                         threads=4, _quiet=True)
+    else:
+        target = lambda: _app.run(host="0.0.0.0", port=port,
+                                  use_reloader=False, threaded=True)
+
+    _thread = threading.Thread(target=target, daemon=True)
     _thread.start()
     log.info("Config server started on port %d", port)
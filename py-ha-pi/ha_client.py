@@ -1,33 +1,132 @@
 """Home Assistant REST API client using requests."""
 
+import json
 import logging
+import socket
+import ssl
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from websockets.sync.client import connect as _ws_connect
+except ImportError:  # websocket push unavailable — callers fall back to polling
+    _ws_connect = None
+
+try:
+    from orjson import loads as _loads  # native parser, ~3-5x faster on ARM
+except ImportError:
+    _loads = json.loads
+
+try:
+    import msgspec
+
+    class HAState(msgspec.Struct):
+        """Slice of an /api/states entry — decoded straight into slots,
+        skipping a full dict per entity."""
+        entity_id: str
+        state: str
+
+    _STATES_DECODER = msgspec.json.Decoder(list[HAState])
+except ImportError:
+    _STATES_DECODER = None
 
 log = logging.getLogger("ha_client")
 
+MAX_LIGHTS = 16  # matches config.MAX_LIGHTS
+WS_RECONNECT_DELAY = 5  # seconds between reconnect attempts
+
+# Raw HA states -> the three states the UI understands. Anything not listed
+# (e.g. "unavailable") normalizes to "unknown" via .get's default.
+_STATE_MAP = {"on": "on", "off": "off"}
+
+# Safety net for any socket opened without an explicit timeout
+socket.setdefaulttimeout(5)
+
+# One TLS context for the whole process — building it parses the system CA
+# bundle, which is a real per-session cost on Pi-class CPUs.
+_SSL_CTX = ssl.create_default_context()
+
+
+class _SharedSSLAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools reuse the module-level SSLContext."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["ssl_context"] = _SSL_CTX
+        super().init_poolmanager(*args, **kwargs)
+
 _base_url: str = ""
 _token: str = ""
-_session: requests.Session | None = None
+_initialized = False
+_generation = 0  # bumped by init() so stale thread-local sessions get rebuilt
+
+# Each worker thread gets its own Session so concurrent polls don't contend
+# on one connection pool's checkout lock.
+_tls = threading.local()
+_sessions: "weakref.WeakSet[requests.Session]" = weakref.WeakSet()
+_sessions_lock = threading.Lock()
+
+_ws_thread: threading.Thread | None = None
+_ws_stop: threading.Event | None = None  # owned by the current stream thread
+_ws_conn = None  # live connection, closed by unsubscribe to unblock recv
+_ws_lock = threading.Lock()
 
 
 def init(base_url: str, token: str) -> None:
-    global _base_url, _token, _session
+    global _base_url, _token, _initialized, _generation
     _base_url = base_url.rstrip("/")
     _token = token
-    _session = requests.Session()
-    _session.headers.update({
-        "Authorization": f"Bearer {token}",
+    _generation += 1
+    _initialized = True
+
+
+def _make_session() -> requests.Session:
+    session = requests.Session()
+    session.headers.update({
+        "Authorization": f"Bearer {_token}",
         "Content-Type": "application/json",
+        "Connection": "keep-alive",
     })
-    _session.timeout = 10
+
+    # A couple of retries so a transient HA restart doesn't mark lights
+    # unknown; pool per thread stays small since each thread owns its own.
+    adapter = _SharedSSLAdapter(
+        pool_connections=1,
+        pool_maxsize=2,
+        max_retries=Retry(total=2, backoff_factor=0.2,
+                          status_forcelist=[502, 503, 504]),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _get_session() -> requests.Session | None:
+    """Return this thread's Session, creating or refreshing it as needed."""
+    if not _initialized:
+        return None
+    if getattr(_tls, "generation", None) != _generation:
+        old = getattr(_tls, "session", None)
+        if old:
+            old.close()
+        _tls.session = _make_session()
+        _tls.generation = _generation
+        with _sessions_lock:
+            _sessions.add(_tls.session)
+    return _tls.session
 
 
 def get_state(entity_id: str) -> str:
     """Fetch entity state. Returns 'on', 'off', or 'unknown'."""
-    if not _session:
+    session = _get_session()
+    if not session:
         return "unknown"
     try:
-        r = _session.get(f"{_base_url}/api/states/{entity_id}", timeout=10)
+        r = session.get(f"{_base_url}/api/states/{entity_id}", timeout=10)
         if r.status_code >= 400:
             log.warning("GET %s returned %d", entity_id, r.status_code)
             return "unknown"
@@ -39,16 +138,17 @@ def get_state(entity_id: str) -> str:
 
 def toggle_light(entity_id: str) -> bool:
     """Toggle a light. Returns True on success."""
-    if not _session:
+    session = _get_session()
+    if not session:
         return False
 
-    current = get_state(entity_id)
-    service = "turn_off" if current == "on" else "turn_on"
+    # HA flips the state server-side, so no need to GET the current state
+    # first — one round-trip per tap instead of two.
     domain = entity_id.split(".")[0] if "." in entity_id else "light"
 
     try:
-        r = _session.post(
-            f"{_base_url}/api/services/{domain}/{service}",
+        r = session.post(
+            f"{_base_url}/api/services/{domain}/toggle",
             json={"entity_id": entity_id},
             timeout=10,
         )
@@ -61,22 +161,160 @@ def toggle_light(entity_id: str) -> bool:
         return False
 
 
-def poll_all(lights: list[dict]) -> dict[str, str]:
-    """Poll all lights, return {entity_id: state} dict."""
-    states = {}
-    for light in lights:
-        eid = light["entity_id"]
-        states[eid] = get_state(eid)
-    return states
+def poll_all(entity_ids: frozenset[str]) -> dict[str, str]:
+    """Poll the given entities in one request, return {entity_id: state}.
+
+    States are normalized to "on"/"off"/"unknown" so callers can feed them
+    straight to the UI. Callers pass a prebuilt frozenset (see
+    App._wanted_ids) so membership tests against the full /api/states
+    response are O(1) with no per-poll set construction.
+    """
+    session = _get_session()
+    if not entity_ids or not session:
+        return dict.fromkeys(entity_ids, "unknown")
+    try:
+        r = session.get(f"{_base_url}/api/states", timeout=10)
+        if r.status_code < 400:
+            found = {}
+            # Feed raw bytes to the parser — skips requests' charset
+            # detection and an extra str copy of the whole body.
+            if _STATES_DECODER is not None:
+                for s in _STATES_DECODER.decode(r.content):
+                    if s.entity_id in entity_ids:
+                        found[s.entity_id] = s.state
+            else:
+                for s in _loads(r.content):
+                    eid = s["entity_id"]
+                    if eid in entity_ids:
+                        found[eid] = s["state"]
+            # Guarded so the poll path pays nothing when DEBUG is off
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("poll_all: %d/%d entities matched",
+                          len(found), len(entity_ids))
+            return {
+                eid: _STATE_MAP.get(found.get(eid, ""), "unknown")
+                for eid in entity_ids
+            }
+        log.warning("GET /api/states returned %d, falling back to per-entity polls",
+                    r.status_code)
+    except Exception as e:
+        log.error("Bulk state poll failed: %s", e)
+        return dict.fromkeys(entity_ids, "unknown")
+
+    # Fallback: one GET per entity, fanned out so wall time is ~one RTT
+    # instead of N (each worker thread gets its own session).
+    with ThreadPoolExecutor(max_workers=min(MAX_LIGHTS, len(entity_ids))) as ex:
+        results = ex.map(lambda eid: (eid, get_state(eid)), entity_ids)
+        return {eid: _STATE_MAP.get(s, "unknown") for eid, s in results}
+
+
+def subscribe(lights: list[dict], on_state_change, on_connect=None) -> bool:
+    """Subscribe to state_changed pushes over HA's websocket API.
+
+    Calls on_state_change(entity_id, state) from a daemon thread for every
+    change to a configured light, so polling is only needed at startup.
+    on_connect (if given) fires after every successful (re)subscribe so the
+    caller can refresh a full snapshot — push only delivers deltas, and
+    anything that changed while disconnected would otherwise stay stale.
+    Returns False (caller keeps polling) if websockets isn't available.
+    """
+    global _ws_thread, _ws_stop
+    if _ws_connect is None or not _base_url or not _token:
+        return False
+
+    unsubscribe()
+    wanted = frozenset(l["entity_id"] for l in lights)
+    stop = threading.Event()  # owned by this loop, so old loops can't miss it
+    _ws_stop = stop
+    _ws_thread = threading.Thread(
+        target=_ws_loop, args=(stop, wanted, on_state_change, on_connect),
+        daemon=True,
+    )
+    _ws_thread.start()
+    return True
+
+
+def _ws_loop(stop: threading.Event, wanted: frozenset, on_state_change,
+             on_connect=None) -> None:
+    """Websocket read loop — auth, subscribe, dispatch. Reconnects on drop.
+
+    Auth failures also retry (the token may be fixed via the web config),
+    so a subscribed caller never ends up with neither push nor polling.
+    """
+    global _ws_conn
+    ws_url = _base_url.replace("http", "ws", 1) + "/api/websocket"
+    while not stop.is_set():
+        try:
+            with _ws_connect(ws_url) as ws:
+                with _ws_lock:
+                    _ws_conn = ws
+                try:
+                    ws.recv()  # auth_required
+                    ws.send(json.dumps({"type": "auth", "access_token": _token}))
+                    reply = json.loads(ws.recv())
+                    if reply.get("type") != "auth_ok":
+                        log.error("Websocket auth failed: %s — retrying in %ds",
+                                  reply.get("type"), WS_RECONNECT_DELAY)
+                    else:
+                        ws.send(json.dumps({
+                            "id": 1, "type": "subscribe_events",
+                            "event_type": "state_changed",
+                        }))
+                        if on_connect is not None:
+                            on_connect()
+                        for raw in ws:
+                            if stop.is_set():
+                                return
+                            msg = json.loads(raw)
+                            if msg.get("type") != "event":
+                                continue
+                            data = msg["event"]["data"]
+                            eid = data.get("entity_id")
+                            new_state = data.get("new_state")
+                            if eid in wanted and new_state:
+                                on_state_change(eid, _STATE_MAP.get(
+                                    new_state.get("state", ""), "unknown"))
+                finally:
+                    with _ws_lock:
+                        if _ws_conn is ws:
+                            _ws_conn = None
+        except Exception as e:
+            if not stop.is_set():
+                log.warning("Websocket stream dropped: %s", e)
+        stop.wait(WS_RECONNECT_DELAY)
+
+
+def unsubscribe() -> None:
+    """Stop the websocket stream thread and wait for it to exit."""
+    global _ws_thread, _ws_stop, _ws_conn
+    thread = _ws_thread
+    if not thread:
+        return
+    _ws_thread = None
+    if _ws_stop:
+        _ws_stop.set()
+        _ws_stop = None
+    with _ws_lock:
+        conn, _ws_conn = _ws_conn, None
+    if conn:
+        try:
+            conn.close()  # unblocks a loop parked in recv()
+        except Exception:
+            pass
+    thread.join(timeout=2)
+    if thread.is_alive():
+        log.warning("Websocket stream thread did not exit promptly")
 
 
 def test_connection(url: str, token: str) -> tuple[bool, str]:
     """Test HA connectivity. Returns (ok, message)."""
     try:
+        # (connect, read) tuple — a typo'd URL fails in 2s instead of
+        # holding the web config worker for the full read timeout.
         r = requests.get(
             f"{url.rstrip('/')}/api/",
             headers={"Authorization": f"Bearer {token}"},
-            timeout=10,
+            timeout=(2, 5),
         )
         if r.status_code == 200:
             return True, "Connected successfully"
@@ -89,7 +327,9 @@ def test_connection(url: str, token: str) -> tuple[bool, str]:
 
 
 def cleanup() -> None:
-    global _session
-    if _session:
-        _session.close()
-        _session = None
+    global _initialized
+    unsubscribe()
+    _initialized = False
+    with _sessions_lock:
+        for session in list(_sessions):
+            session.close()
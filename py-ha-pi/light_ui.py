@@ -19,6 +19,17 @@ DOT_SIZE = 8
 DOT_SPACING = 16
 DOT_Y = DISP_H - 20
 
+# Rounded-rect outline for a tile at origin — all tiles share one size, so
+# the 12-point polygon is computed once and translated per tile.
+_ROUND_RECT_TEMPLATE = [
+    TILE_RADIUS, 0, TILE_W - TILE_RADIUS, 0,
+    TILE_W, 0, TILE_W, TILE_RADIUS,
+    TILE_W, TILE_H - TILE_RADIUS, TILE_W, TILE_H,
+    TILE_W - TILE_RADIUS, TILE_H, TILE_RADIUS, TILE_H,
+    0, TILE_H, 0, TILE_H - TILE_RADIUS,
+    0, TILE_RADIUS, 0, 0,
+]
+
 # Colours
 COLOR_BG = "#1A1A2E"
 STYLES = {
@@ -27,6 +38,12 @@ STYLES = {
     "unknown": {"bg": "#3A3A5C", "fg": "#7777AA", "icon": "#6666AA"},
 }
 
+# Interned references — `optimistic` stores these directly so the hot restyle
+# path is one dict lookup and an identity check, no state-string indirection.
+STYLE_ON = STYLES["on"]
+STYLE_OFF = STYLES["off"]
+STYLE_UNKNOWN = STYLES["unknown"]
+
 
 class LightUI:
     def __init__(self, root: tk.Tk, lights: list[dict], toggle_cb=None):
@@ -36,9 +53,10 @@ class LightUI:
         self.page_count = max(1, math.ceil(len(self.lights) / PER_PAGE))
         self.current_page = 0
 
-        # State tracking
+        # State tracking: states holds "on"/"off"/"unknown" strings,
+        # optimistic holds interned style-dict references.
         self.states = {l["entity_id"]: "unknown" for l in self.lights}
-        self.optimistic = dict(self.states)
+        self.optimistic = dict.fromkeys(self.states, STYLE_UNKNOWN)
 
         # Root window setup
         self.root.configure(bg=COLOR_BG)
@@ -91,61 +109,62 @@ class LightUI:
     #  Build tiles
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _tile_geometry(i: int) -> tuple[int, int, int, int]:
+        """Return (page, slot, base_x, y) for the tile at index i."""
+        page = i // PER_PAGE
+        slot = i % PER_PAGE
+        col = slot % COLS
+        row = slot // COLS
+
+        # Position relative to page (page offset applied in _show_page)
+        x = OUTER_PAD + col * (TILE_W + TILE_GAP)
+        y = OUTER_PAD + row * (TILE_H + TILE_GAP)
+
+        # Base x includes the page offset
+        return page, slot, x + page * DISP_W, y
+
     def _build_tiles(self):
         for i, light in enumerate(self.lights):
-            page = i // PER_PAGE
-            slot = i % PER_PAGE
-            col = slot % COLS
-            row = slot // COLS
+            self._build_tile(i, light)
 
-            # Position relative to page (page offset applied in _show_page)
-            x = OUTER_PAD + col * (TILE_W + TILE_GAP)
-            y = OUTER_PAD + row * (TILE_H + TILE_GAP)
+    def _build_tile(self, i: int, light: dict):
+        page, slot, base_x, y = self._tile_geometry(i)
+        style = STYLE_UNKNOWN
 
-            # Store base x plus page offset
-            base_x = x + page * DISP_W
+        # Rounded rect (approximated with oval-cornered polygon)
+        rect = self._rounded_rect(base_x, y, fill=style["bg"], outline="")
 
-            style = STYLES["unknown"]
+        icon_text = self.canvas.create_text(
+            base_x + TILE_W // 2, y + 40,
+            text=light.get("icon", "💡"), font=("sans-serif", 24),
+            fill=style["icon"], tags=("tile_text",),
+        )
 
-            # Rounded rect (approximated with oval-cornered polygon)
-            rect = self._rounded_rect(
-                base_x, y, base_x + TILE_W, y + TILE_H,
-                TILE_RADIUS, fill=style["bg"], outline="",
-            )
+        name_text = self.canvas.create_text(
+            base_x + TILE_W // 2, y + 85,
+            text=light["label"], font=("sans-serif", 16),
+            fill=style["fg"], width=TILE_W - 20, tags=("tile_text",),
+        )
 
-            icon_text = self.canvas.create_text(
-                base_x + TILE_W // 2, y + 40,
-                text=light.get("icon", "💡"), font=("sans-serif", 24),
-                fill=style["icon"],
-            )
+        eid = light["entity_id"]
+        self.tile_items[eid] = {
+            "rect": rect, "icon_text": icon_text,
+            "name_text": name_text, "base_x": base_x,
+            "cur_x": base_x, "y": y, "page": page, "slot": slot,
+            "applied_style": STYLE_UNKNOWN,
+        }
 
-            name_text = self.canvas.create_text(
-                base_x + TILE_W // 2, y + 85,
-                text=light["label"], font=("sans-serif", 16),
-                fill=style["fg"], width=TILE_W - 20,
-            )
+        # Bind click on all tile elements
+        for item in (rect, icon_text, name_text):
+            self.canvas.tag_bind(item, "<Button-1>",
+                                 lambda e, _eid=eid: self._on_tile_click(_eid))
 
-            eid = light["entity_id"]
-            self.tile_items[eid] = {
-                "rect": rect, "icon_text": icon_text,
-                "name_text": name_text, "base_x": base_x,
-                "y": y, "page": page,
-            }
-
-            # Bind click on all tile elements
-            for item in (rect, icon_text, name_text):
-                self.canvas.tag_bind(item, "<Button-1>",
-                                     lambda e, _eid=eid: self._on_tile_click(_eid))
-
-    def _rounded_rect(self, x1, y1, x2, y2, r, **kwargs):
-        """Draw a rounded rectangle on the canvas."""
+    def _rounded_rect(self, x, y, **kwargs):
+        """Draw a tile-sized rounded rectangle with its corner at (x, y)."""
         points = [
-            x1 + r, y1, x2 - r, y1,
-            x2, y1, x2, y1 + r,
-            x2, y2 - r, x2, y2,
-            x2 - r, y2, x1 + r, y2,
-            x1, y2, x1, y2 - r,
-            x1, y1 + r, x1, y1,
+            c + (x if i % 2 == 0 else y)
+            for i, c in enumerate(_ROUND_RECT_TEMPLATE)
         ]
         return self.canvas.create_polygon(points, smooth=True, **kwargs)
 
@@ -162,7 +181,7 @@ class LightUI:
             x = start_x + i * DOT_SPACING
             dot = self.canvas.create_oval(
                 x, DOT_Y, x + DOT_SIZE, DOT_Y + DOT_SIZE,
-                fill="white", outline="",
+                fill="white", outline="", tags=("dots",),
             )
             self.dot_items.append(dot)
 
@@ -179,46 +198,28 @@ class LightUI:
         offset = -self.current_page * DISP_W
         for eid, items in self.tile_items.items():
             page = items["page"]
-            slot_in_page = list(self.tile_items.keys()).index(eid) % PER_PAGE
-            col = slot_in_page % COLS
-            row = slot_in_page // COLS
+            col = items["slot"] % COLS
             target_x = OUTER_PAD + col * (TILE_W + TILE_GAP) + page * DISP_W + offset
-            y = items["y"]
 
             # Move tile elements
-            self._move_tile(eid, target_x, y)
+            self._move_tile(eid, target_x)
 
+        # One raise per tag keeps text above rects and dots on top, instead
+        # of per-item raises inside the loop.
+        self.canvas.tag_raise("tile_text")
+        self.canvas.tag_raise("dots")
         self._update_dots()
 
-    def _move_tile(self, eid: str, x: int, y: int):
+    def _move_tile(self, eid: str, x: int):
+        """Translate all tile items to x, keeping them (and bindings) alive."""
         items = self.tile_items[eid]
-        # Delete old rect and redraw at new position
-        self.canvas.delete(items["rect"])
-        style_key = self.optimistic.get(eid, "unknown")
-        if style_key not in STYLES:
-            style_key = "unknown"
-        style = STYLES[style_key]
-
-        rect = self._rounded_rect(
-            x, y, x + TILE_W, y + TILE_H,
-            TILE_RADIUS, fill=style["bg"], outline="",
-        )
-        self.canvas.coords(items["icon_text"], x + TILE_W // 2, y + 40)
-        self.canvas.coords(items["name_text"], x + TILE_W // 2, y + 85)
-
-        items["rect"] = rect
-        # Re-bind click
-        for item in (rect, items["icon_text"], items["name_text"]):
-            self.canvas.tag_bind(item, "<Button-1>",
-                                 lambda e, _eid=eid: self._on_tile_click(_eid))
-
-        # Ensure text is above rect
-        self.canvas.tag_raise(items["icon_text"])
-        self.canvas.tag_raise(items["name_text"])
-
-        # Keep dots on top
-        for dot in self.dot_items:
-            self.canvas.tag_raise(dot)
+        dx = x - items["cur_x"]
+        if not dx:
+            return
+        self.canvas.move(items["rect"], dx, 0)
+        self.canvas.move(items["icon_text"], dx, 0)
+        self.canvas.move(items["name_text"], dx, 0)
+        items["cur_x"] = x
 
     # ------------------------------------------------------------------
     #  Swipe handling
@@ -248,12 +249,12 @@ class LightUI:
     # ------------------------------------------------------------------
 
     def _on_tile_click(self, entity_id: str):
-        current = self.optimistic.get(entity_id, "unknown")
+        style = self.optimistic.get(entity_id, STYLE_UNKNOWN)
         # Optimistic toggle
-        if current == "on":
-            nxt = "off"
+        if style is STYLE_ON:
+            nxt, current = STYLE_OFF, "on"
         else:
-            nxt = "on"
+            nxt, current = STYLE_ON, "off" if style is STYLE_OFF else "unknown"
 
         self.optimistic[entity_id] = nxt
         self._apply_style(entity_id)
@@ -262,17 +263,17 @@ class LightUI:
             self.toggle_cb(entity_id, current)
 
     def _apply_style(self, entity_id: str):
-        if entity_id not in self.tile_items:
+        items = self.tile_items.get(entity_id)
+        if items is None:
             return
-        items = self.tile_items[entity_id]
-        state = self.optimistic.get(entity_id, "unknown")
-        if state not in STYLES:
-            state = "unknown"
-        style = STYLES[state]
+        style = self.optimistic.get(entity_id, STYLE_UNKNOWN)
+        if items.get("applied_style") is style:
+            return  # no-op during steady-state polling
 
         self.canvas.itemconfigure(items["rect"], fill=style["bg"])
         self.canvas.itemconfigure(items["icon_text"], fill=style["icon"])
         self.canvas.itemconfigure(items["name_text"], fill=style["fg"])
+        items["applied_style"] = style
 
     # ------------------------------------------------------------------
     #  Public API
@@ -283,7 +284,7 @@ class LightUI:
         if entity_id not in self.states:
             return
         self.states[entity_id] = state
-        self.optimistic[entity_id] = state
+        self.optimistic[entity_id] = STYLES.get(state, STYLE_UNKNOWN)
         self._apply_style(entity_id)
 
     def destroy(self):
@@ -292,19 +293,65 @@ class LightUI:
         self.dot_items.clear()
 
     def rebuild(self, lights: list[dict]):
-        """Tear down and rebuild with new light list."""
-        self.destroy()
-        self.lights = lights[:MAX_LIGHTS]
+        """Update tiles to match a new light list, reusing unchanged items."""
+        new_lights = lights[:MAX_LIGHTS]
+
+        # Entering or leaving the setup screen — nothing to diff against.
+        if not self.lights or not new_lights:
+            self.destroy()
+            self.lights = new_lights
+            self.page_count = max(1, math.ceil(len(self.lights) / PER_PAGE))
+            self.current_page = 0
+            self.states = {l["entity_id"]: "unknown" for l in self.lights}
+            self.optimistic = dict.fromkeys(self.states, STYLE_UNKNOWN)
+            if not self.lights:
+                self._show_setup_screen()
+            else:
+                self._build_tiles()
+                self._build_dots()
+                self._show_page(animate=False)
+            return
+
+        old_page_count = self.page_count
+        self.lights = new_lights
         self.page_count = max(1, math.ceil(len(self.lights) / PER_PAGE))
         self.current_page = 0
-        self.states = {l["entity_id"]: "unknown" for l in self.lights}
-        self.optimistic = dict(self.states)
-        self.tile_items = {}
-        self.dot_items = []
 
-        if not self.lights:
-            self._show_setup_screen()
-        else:
-            self._build_tiles()
+        # Drop tiles for removed lights
+        new_ids = {l["entity_id"] for l in self.lights}
+        for eid in list(self.tile_items):
+            if eid not in new_ids:
+                items = self.tile_items.pop(eid)
+                self.canvas.delete(items["rect"], items["icon_text"],
+                                   items["name_text"])
+                self.states.pop(eid, None)
+                self.optimistic.pop(eid, None)
+
+        # Create added tiles, refresh kept ones in place
+        for i, light in enumerate(self.lights):
+            eid = light["entity_id"]
+            items = self.tile_items.get(eid)
+            if items is None:
+                self._build_tile(i, light)
+                self.states[eid] = "unknown"
+                self.optimistic[eid] = STYLE_UNKNOWN
+                continue
+
+            page, slot, base_x, y = self._tile_geometry(i)
+            dy = y - items["y"]
+            if dy:
+                self.canvas.move(items["rect"], 0, dy)
+                self.canvas.move(items["icon_text"], 0, dy)
+                self.canvas.move(items["name_text"], 0, dy)
+            items.update(base_x=base_x, y=y, page=page, slot=slot)
+            self.canvas.itemconfigure(items["icon_text"],
+                                      text=light.get("icon", "💡"))
+            self.canvas.itemconfigure(items["name_text"], text=light["label"])
+
+        if self.page_count != old_page_count:
+            self.canvas.delete("dots")
+            self.dot_items = []
             self._build_dots()
-            self._show_page(animate=False)
+
+        # _show_page handles horizontal repositioning via cur_x deltas
+        self._show_page(animate=False)
@@ -6,17 +6,21 @@ Touchscreen app for Raspberry Pi that controls Home Assistant lights.
 Tap tiles to toggle, swipe to page. Web config at :8080.
 """
 
+import concurrent.futures
 import logging
 import os
+import queue
 import signal
 import sys
 import tkinter as tk
 
 import config
-import config_server
 import ha_client
 from light_ui import LightUI
 
+# config_server (and its Flask dependency chain) is imported lazily in
+# App._start_web so it doesn't slow down time-to-first-pixel.
+
 # Ensure we target the right X display — LCD-show typically uses :0
 # If running via SSH or systemd, DISPLAY may not be set
 if "DISPLAY" not in os.environ:
@@ -43,6 +47,8 @@ log = logging.getLogger("main")
 DEFAULT_CONFIG_PATH = "/etc/ha_lights.conf"
 WEB_PORT = 8080
 POLL_INTERVAL_MS = 5000
+QUEUE_DRAIN_MS = 100
+TOGGLE_DEBOUNCE_MS = 250
 
 
 class App:
@@ -53,6 +59,31 @@ class App:
         self.cfg: dict = {}
         self.ha_ok = False
 
+        # Derived from cfg on load/reload so per-tick code never rebuilds them
+        self._lights_list: list[dict] = []
+        self._wanted_ids: frozenset[str] = frozenset()
+
+        # Pushed state changes land here from the websocket thread and are
+        # drained onto the Tk thread by _drain_queue.
+        self._q: queue.Queue = queue.Queue()
+        self._drain_scheduled = False
+        self._poll_scheduled = False
+
+        # {entity_id: Tk after-id} for pending debounced toggles
+        self._toggle_after: dict[str, str] = {}
+
+        # Last state handed to the UI — steady-state polls touch nothing
+        self._last_state: dict[str, str] = {}
+
+        # Set while the window is unmapped (display blanked) — polls that
+        # nobody can see are skipped
+        self._paused = False
+
+        # HA HTTP calls run here so a slow response never freezes the UI;
+        # four workers let a burst of taps fire alongside an in-flight poll
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="ha-io")
+
     def run(self, config_path: str):
         # Load config
         try:
@@ -62,87 +93,214 @@ class App:
             self.cfg = {"ha_url": "", "ha_token": "", "web_password": "", "lights": []}
 
         config.set_path(config_path)
+        self._cache_lights()
 
-        # Fullscreen on Pi — works with LCD-show's X11 setup
+        # Fullscreen on Pi — works with LCD-show's X11 setup. Geometry is
+        # set first so overrideredirect/fullscreen don't trigger a visible
+        # re-layout, and both wm attributes go in one Tcl call.
+        self.root.geometry("480x320+0+0")
+        self.root.overrideredirect(True)
         try:
-            self.root.attributes("-fullscreen", True)
+            self.root.wm_attributes("-fullscreen", True, "-topmost", True)
         except tk.TclError:
             pass
-
-        # Override window manager to stay on top and remove decorations
-        self.root.overrideredirect(True)
         self.root.configure(cursor="none")  # hide cursor for touchscreen
-
-        # Force geometry to match the SPI display
-        self.root.geometry("480x320+0+0")
+        self.root.update_idletasks()
 
         # Build UI
         self.ui = LightUI(self.root, self.cfg.get("lights", []),
                           toggle_cb=self._on_toggle)
 
+        # Pause polling while the display can't show the result
+        self.root.bind("<Unmap>", self._on_unmap)
+        self.root.bind("<Map>", self._on_map)
+
         # Init HA client
         url = self.cfg.get("ha_url", "")
         token = self.cfg.get("ha_token", "")
         if url and token:
             ha_client.init(url, token)
             self.ha_ok = True
-            self._poll_states()
+            # Bootstrap snapshot after the first paint — the initial fetch
+            # shouldn't gate time-to-first-pixel
+            self.root.after_idle(self._poll_states)
         else:
             log.warning("HA credentials not configured — use web config at :%d", WEB_PORT)
 
-        # Start web config server
-        try:
-            config_server.start(WEB_PORT, self.cfg, reload_cb=self._on_config_reload)
-        except Exception as e:
-            log.error("Config server failed (non-fatal): %s", e)
+        # Start web config server once the UI is up
+        self.root.after_idle(self._start_web)
 
-        # Schedule polling
+        # Websocket push where possible, fixed-interval polling otherwise
         if self.ha_ok:
-            self.root.after(POLL_INTERVAL_MS, self._poll_loop)
+            self._start_updates()
 
         # Handle Ctrl+C
-        signal.signal(signal.SIGINT, lambda *_: self._shutdown())
-        signal.signal(signal.SIGTERM, lambda *_: self._shutdown())
+        signal.signal(signal.SIGINT, self._signal_handler)
+        signal.signal(signal.SIGTERM, self._signal_handler)
 
         # Allow signal handling in mainloop
-        self._check_signals()
+        self._install_signal_wakeup()
 
         log.info("ha-pi: running (config=%s)", config_path)
         self.root.mainloop()
 
+    def _signal_handler(self, signum, frame):
+        """Quit from the Tk thread — the wakeup fd makes this run promptly."""
+        self.root.after(0, self._shutdown)
+
+    def _install_signal_wakeup(self):
+        """Wake the Tk event loop as soon as a signal is delivered.
+
+        A wakeup pipe makes mainloop return from its select() immediately,
+        so the Python-level handlers run without a periodic after() timer.
+        """
+        try:
+            r, w = os.pipe()
+            os.set_blocking(r, False)
+            os.set_blocking(w, False)
+            signal.set_wakeup_fd(w)
+            self.root.tk.createfilehandler(
+                r, tk.READABLE, lambda fd, mask: os.read(r, 64))
+        except (AttributeError, OSError, tk.TclError) as e:
+            # createfilehandler is unavailable on some Tcl builds —
+            # fall back to periodic wakeups
+            log.warning("Signal wakeup fd unavailable (%s), polling instead", e)
+            self._check_signals()
+
     def _check_signals(self):
-        """Periodically yield to allow signal handlers to fire."""
+        """Periodically yield to allow signal handlers to fire (fallback)."""
         self.root.after(500, self._check_signals)
 
     def _on_toggle(self, entity_id: str, current_state: str):
         """Called when user taps a tile."""
-        if self.ha_ok:
-            # Fire toggle in background to avoid blocking UI
-            self.root.after(1, lambda: ha_client.toggle_light(entity_id))
+        if not self.ha_ok:
+            return
+        # The tile just flipped optimistically, so the last state we sent no
+        # longer reflects what's shown — drop it so the next poll always
+        # reaches the UI and corrects a failed toggle.
+        self._last_state.pop(entity_id, None)
+        # Debounce: a second tap inside the window lands the tile back on its
+        # original state, so the two toggles cancel out and neither is sent.
+        after_id = self._toggle_after.pop(entity_id, None)
+        if after_id:
+            self.root.after_cancel(after_id)
+            return
+        self._toggle_after[entity_id] = self.root.after(
+            TOGGLE_DEBOUNCE_MS, lambda: self._fire_toggle(entity_id))
+
+    def _fire_toggle(self, entity_id: str):
+        self._toggle_after.pop(entity_id, None)
+        fut = self._pool.submit(ha_client.toggle_light, entity_id)
+        fut.add_done_callback(self._on_toggle_done)
+
+    def _on_toggle_done(self, fut):
+        """Runs on the pool thread — a failed toggle produces no
+        state_changed event, so re-poll to revert the optimistic flip."""
+        try:
+            ok = fut.result()
+        except Exception as e:
+            log.error("Toggle failed: %s", e)
+            ok = False
+        if not ok:
+            self.root.after(0, self._poll_states)
 
     def _poll_states(self):
-        """Fetch all light states and update UI."""
+        """Fetch all light states off-thread and update UI when done."""
         if not self.ha_ok or not self.ui:
             return
-        lights = self.cfg.get("lights", [])
-        states = ha_client.poll_all(lights)
+        fut = self._pool.submit(ha_client.poll_all, self._wanted_ids)
+        fut.add_done_callback(self._on_poll_done)
+
+    def _on_poll_done(self, fut):
+        """Runs on the pool thread — marshal results back to Tk."""
+        try:
+            states = fut.result()
+        except Exception as e:
+            log.error("State poll failed: %s", e)
+            return
+        self.root.after(0, self._apply_states, states)
+
+    def _apply_states(self, states: dict):
+        # States arrive pre-normalized from ha_client
+        if not self.ui:
+            return
         for eid, state in states.items():
-            if state in ("on", "off"):
+            if self._last_state.get(eid) != state:
+                self._last_state[eid] = state
                 self.ui.set_state(eid, state)
-            elif state == "unavailable":
-                self.ui.set_state(eid, "unknown")
+
+    def _start_web(self):
+        """Start the web config server (deferred past first paint)."""
+        try:
+            import config_server
+            self._config_server = config_server
+            config_server.start(WEB_PORT, self.cfg, reload_cb=self._on_config_reload)
+        except Exception as e:
+            log.error("Config server failed (non-fatal): %s", e)
+
+    def _cache_lights(self):
+        """Refresh the cached light list + wanted-id set from self.cfg."""
+        self._lights_list = self.cfg.get("lights", [])
+        self._wanted_ids = frozenset(l["entity_id"] for l in self._lights_list)
+
+    def _start_updates(self):
+        """Subscribe to websocket pushes, falling back to interval polling."""
+        if ha_client.subscribe(self._lights_list, self._enqueue_state,
+                               on_connect=self._on_ws_connected):
+            if not self._drain_scheduled:
+                self._drain_scheduled = True
+                self.root.after(QUEUE_DRAIN_MS, self._drain_queue)
+        elif not self._poll_scheduled:
+            self._poll_scheduled = True
+            self.root.after(POLL_INTERVAL_MS, self._poll_loop)
+
+    def _enqueue_state(self, entity_id: str, state: str):
+        """Called from the websocket thread — hand off to the Tk thread."""
+        self._q.put((entity_id, state))
+
+    def _on_ws_connected(self):
+        """Called from the websocket thread after every (re)connect.
+
+        Push only delivers deltas, so each fresh subscription needs a full
+        snapshot to catch anything missed while disconnected.
+        """
+        self.root.after(0, self._poll_states)
+
+    def _drain_queue(self):
+        """Apply queued state pushes on the Tk thread."""
+        try:
+            while True:
+                eid, state = self._q.get_nowait()
+                if self._last_state.get(eid) != state:
+                    self._last_state[eid] = state
+                    self.ui.set_state(eid, state)
+        except queue.Empty:
+            pass
+        self.root.after(QUEUE_DRAIN_MS, self._drain_queue)
 
     def _poll_loop(self):
         """Periodic polling via tkinter's after()."""
-        self._poll_states()
+        if not self._paused:
+            self._poll_states()
         self.root.after(POLL_INTERVAL_MS, self._poll_loop)
 
+    def _on_unmap(self, _event):
+        self._paused = True
+
+    def _on_map(self, _event):
+        if self._paused:
+            self._paused = False
+            if self.ha_ok:
+                self._poll_states()  # immediate refresh on wake
+
     def _on_config_reload(self):
         """Called by web config server after saving new config."""
         try:
+            old_lights = self._lights_list
             new_cfg = config.reload()
             if new_cfg:
                 self.cfg = new_cfg
+                self._cache_lights()
                 # Re-init HA client if credentials changed
                 url = self.cfg.get("ha_url", "")
                 token = self.cfg.get("ha_token", "")
@@ -150,14 +308,25 @@ class App:
                     ha_client.cleanup()
                     ha_client.init(url, token)
                     self.ha_ok = True
-                # Rebuild UI on main thread
-                self.root.after(0, lambda: self.ui.rebuild(self.cfg.get("lights", [])))
+                    self._start_updates()
+                    # Bootstrap a fresh snapshot — in push mode nothing else
+                    # polls, so rebuilt/new tiles would sit at "unknown"
+                    # until their next state change
+                    self.root.after(0, self._poll_states)
+                # Update UI on main thread, but only if the lights actually
+                # changed — a URL/token-only edit shouldn't touch the canvas.
+                # rebuild() itself diffs per-entity, so unchanged tiles
+                # survive even when the list did change.
+                if self._lights_list != old_lights:
+                    self._last_state.clear()
+                    self.root.after(0, lambda: self.ui.rebuild(self._lights_list))
                 log.info("Config reloaded successfully")
         except Exception as e:
             log.error("Config reload failed: %s", e)
 
     def _shutdown(self):
         log.info("Shutting down")
+        self._pool.shutdown(wait=False, cancel_futures=True)
         ha_client.cleanup()
         self.root.quit()
 